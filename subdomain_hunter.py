@@ -6,18 +6,81 @@ Usage: python subdomain_hunter.py -d example.com
 """
 
 import dns.resolver
+import dns.exception
+import dns.name
+import dns.asyncresolver
 import requests
+import ijson
+import asyncio
 import concurrent.futures
 import argparse
 import json
 import re
 import time
 import sys
+import os
+import gzip
+import hashlib
+import functools
+import threading
+from uuid import uuid4
 from urllib.parse import urlparse
-from typing import Set, List, Dict
-from collections import defaultdict
+from typing import Set, List, Dict, Optional, FrozenSet, Union
+from collections import defaultdict, deque
 from datetime import datetime
 
+# Optional: POSIX only, used to keep in-flight DNS sockets under the fd limit
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Optional: Hyperscan turns web-source matching into a single DFA pass
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# On-disk cache of raw crt.sh responses, reused for a day
+CT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'subdomain_hunter')
+CT_CACHE_TTL = 86400
+
+# Public recursive resolvers queried round-robin during brute-force
+DEFAULT_RESOLVERS = ['8.8.8.8', '1.1.1.1', '9.9.9.9', '208.67.222.222', '8.8.4.4', '1.0.0.1']
+
+# A resolver is dropped once more than this share of its recent queries fail
+RESOLVER_WINDOW = 500
+RESOLVER_MIN_SAMPLES = 100
+RESOLVER_MAX_ERROR_RATE = 0.3
+
+# Brute-force concurrency starts at --threads and grows every interval while
+# failures stay rare: doubling until the first failure spike (slow start),
+# then by a fixed step. It is halved as soon as more than BRUTE_SHRINK_ABOVE
+# of the last BRUTE_FAILURE_WINDOW lookups failed (AIMD)
+BRUTE_MAX_CONCURRENCY = 2000
+BRUTE_TUNE_INTERVAL = 1
+BRUTE_TUNE_STEP = 16
+BRUTE_GROW_BELOW = 0.05
+BRUTE_SHRINK_ABOVE = 0.2
+BRUTE_FAILURE_WINDOW = 50
+BRUTE_MIN_CONCURRENCY = 16
+
+# Lookups whose every attempt failed are re-queued this many times at the end
+BRUTE_RETRIES = 1
+
+# File descriptors kept free for stdout, output/cache files and HTTP sockets;
+# every in-flight async DNS query holds one UDP socket
+FD_HEADROOM = 64
+
+def max_open_sockets() -> Optional[int]:
+    """Return how many DNS sockets may be open at once, or None if unlimited"""
+    if resource is None:
+        return None
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return None
+    return max(soft - FD_HEADROOM, 1)
+
 # Color codes for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -30,6 +93,39 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Letters, digits, hyphen and dot: the only bytes a brute-force candidate may contain
+LDH_BYTES = b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-.'
+
+def is_valid_label(word: bytes, max_length: int = 253) -> bool:
+    """Check that a wordlist entry can form a valid hostname before querying it"""
+    # translate() deletes every LDH byte in one C-level pass; anything left is invalid
+    if len(word) > max_length or word.translate(None, LDH_BYTES):
+        return False
+    for label in word.split(b'.') if b'.' in word else (word,):
+        if not label or len(label) > 63 or label[0] == 45 or label[-1] == 45:  # 45 == ord('-')
+            return False
+    return True
+
+@functools.lru_cache(maxsize=65536)
+def normalize_ct_name(name: str, suffix: str) -> Optional[str]:
+    """Canonicalize a CT hostname; None for wildcards and names outside suffix"""
+    # Cached because SAN lists repeat the same names across many certificates
+    name = name.strip().lower()
+    if '*' in name or not name.endswith(suffix):
+        return None
+    return name
+
+class TeeReader:
+    """File-like wrapper that copies everything read from src into sink"""
+    def __init__(self, src, sink):
+        self.src = src
+        self.sink = sink
+    
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.src.read(size)
+        self.sink.write(chunk)
+        return chunk
+
 def print_banner():
     """Display tool banner"""
     banner = f"""
@@ -47,35 +143,119 @@ def print_banner():
     print(banner)
 
 class SubdomainHunter:
-    def __init__(self, domain: str, threads: int = 50, timeout: int = 5, verbose: bool = False):
+    def __init__(self, domain: str, threads: int = 50, timeout: int = 5, verbose: bool = False,
+                 resolvers: List[str] = None, use_cache: bool = True, output_file: str = None):
         self.domain = domain
+        self._suffix = '.' + domain
         self.threads = threads
         self.timeout = timeout
         self.verbose = verbose
+        self.use_cache = use_cache
         self.subdomains: Set[str] = set()
         self.resolver = dns.resolver.Resolver()
         self.resolver.timeout = timeout
         self.resolver.lifetime = timeout
         
         # Use reliable DNS servers
-        self.resolver.nameservers = ['8.8.8.8', '1.1.1.1', '8.8.4.4']
+        self.nameservers = list(resolvers or DEFAULT_RESOLVERS)
+        self.resolver.nameservers = self.nameservers
+        
+        # One async resolver per nameserver so brute-force load is spread
+        # across all of them instead of piling onto the first
+        self._resolver_pool = [self._make_resolver(ns) for ns in self.nameservers]
+        self._next_resolver = 0
+        
+        # Brute-force concurrency state (see _tune_concurrency / _note_outcome)
+        self._limit = max(threads, 1)
+        self._max_limit = max(BRUTE_MAX_CONCURRENCY, threads * 20)
+        self._slow_start = True
+        self._outcomes = deque(maxlen=BRUTE_FAILURE_WINDOW)
+        self._backlog = 0
+        self._queries_recent = 0
+        self._failures_recent = 0
+        
+        # Addresses a random label resolves to; brute-force hits matching them are dropped
+        self._wildcard_ips: FrozenSet[str] = frozenset()
+        
+        # Guards self.subdomains (see add_subdomain) while passive phases
+        # run on worker threads
+        self._lock = threading.Lock()
+        
+        # Shared HTTP session: keep-alive connections are reused across sources
+        self.session = requests.Session()
+        
+        # Matches full hostnames under the target in free-form API responses;
+        # works on raw bytes since hostnames are ASCII, so bodies are never decoded
+        self._subdomain_re = re.compile(rb'(?:[a-z0-9][-a-z0-9]*\.)+' + re.escape(self.domain.encode()), re.IGNORECASE)
+        self._subdomain_db = None
+        if hyperscan is not None:
+            self._subdomain_db = hyperscan.Database()
+            self._subdomain_db.compile(
+                expressions=[rb'(?:[a-z0-9][-a-z0-9]*\.)+' + re.escape(self.domain.encode())],
+                ids=[0],
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST]
+            )
+        
+        # Log output helpers: cached timestamp string and buffered brute-force hits
+        self._timestamp_cache = (0, "")
+        self._hits: List[str] = []
+        self._progress_line = ""
+        
+        # Discoveries are streamed to <output_file>.txt as they are found
+        if not output_file:
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            output_file = f"subdomains_{self.domain}_{timestamp}"
+        self.output_file = output_file
+        self._out_fp = None
+        self._stream_path = None
         
         self.start_time = time.time()
     
     def log(self, message: str, level: str = "info"):
         """Print colored log messages"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        line = self._format_log(message, level)
+        if line:
+            print(line)
+    
+    def _format_log(self, message: str, level: str) -> str:
+        """Build a colored log line"""
+        timestamp = self._timestamp()
         
         if level == "info":
-            print(f"{Colors.BLUE}[{timestamp}] [*]{Colors.END} {message}")
+            return f"{Colors.BLUE}[{timestamp}] [*]{Colors.END} {message}"
         elif level == "success":
-            print(f"{Colors.GREEN}[{timestamp}] [+]{Colors.END} {message}")
+            return f"{Colors.GREEN}[{timestamp}] [+]{Colors.END} {message}"
         elif level == "error":
-            print(f"{Colors.RED}[{timestamp}] [-]{Colors.END} {message}")
+            return f"{Colors.RED}[{timestamp}] [-]{Colors.END} {message}"
         elif level == "warning":
-            print(f"{Colors.YELLOW}[{timestamp}] [!]{Colors.END} {message}")
+            return f"{Colors.YELLOW}[{timestamp}] [!]{Colors.END} {message}"
         elif level == "found":
-            print(f"{Colors.CYAN}[{timestamp}] [FOUND]{Colors.END} {Colors.GREEN}{message}{Colors.END}")
+            return f"{Colors.CYAN}[{timestamp}] [FOUND]{Colors.END} {Colors.GREEN}{message}{Colors.END}"
+        return ""
+    
+    def _timestamp(self) -> str:
+        """Return the current HH:MM:SS, formatting it at most once per second"""
+        now = int(time.time())
+        second, text = self._timestamp_cache
+        if now != second:
+            text = datetime.fromtimestamp(now).strftime("%H:%M:%S")
+            self._timestamp_cache = (now, text)
+        return text
+    
+    def _flush_hits(self):
+        """Write buffered brute-force hits to stdout in one call"""
+        if not self._hits:
+            return
+        lines, self._hits = self._hits, []
+        # Print above the progress bar, then redraw it
+        sys.stdout.write('\r\033[K' + '\n'.join(lines) + '\n' + self._progress_line)
+        sys.stdout.flush()
+    
+    async def _flush_hits_periodically(self):
+        """Drain the hit buffer every 100ms while brute-force runs"""
+        while True:
+            await asyncio.sleep(0.1)
+            self._flush_hits()
     
     def run_all(self, wordlist_path: str = None, enable_ct: bool = True, 
                 enable_brute: bool = True, enable_web: bool = True,
@@ -84,6 +264,10 @@ class SubdomainHunter:
         self.log(f"Starting subdomain enumeration for: {Colors.BOLD}{self.domain}{Colors.END}", "info")
         print()
         
+        # Line-buffered so every discovery survives a crash or Ctrl-C
+        self._stream_path = f"{self.output_file}.txt"
+        self._out_fp = open(self._stream_path, 'w', buffering=1)
+        
         results = {
             'domain': self.domain,
             'subdomains': [],
@@ -91,31 +275,42 @@ class SubdomainHunter:
             'scan_time': 0
         }
         
+        # Passive phases only wait on remote servers, so run them side by side
+        passive = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+            if enable_ct:
+                self.log("Phase 1: Certificate Transparency Logs", "info")
+                passive['ct_logs'] = executor.submit(self.search_ct_logs)
+            if enable_web:
+                self.log("Phase 2: Web Sources & APIs", "info")
+                passive['web_search'] = executor.submit(self.web_search)
+            if enable_zone:
+                self.log("Phase 3: DNS Zone Transfer", "info")
+                passive['zone_transfer'] = executor.submit(self.zone_transfer)
+        if passive:
+            print()
+        
         # Certificate Transparency Logs
         if enable_ct:
-            self.log("Phase 1: Certificate Transparency Logs", "info")
-            ct_subs = self.search_ct_logs()
+            ct_subs = passive['ct_logs'].result()
             results['statistics']['ct_logs'] = len(ct_subs)
             self.log(f"Found {Colors.BOLD}{len(ct_subs)}{Colors.END} subdomains from CT logs", "success")
-            print()
         
         # Web Sources
         if enable_web:
-            self.log("Phase 2: Web Sources & APIs", "info")
-            web_subs = self.web_search()
+            web_subs = passive['web_search'].result()
             results['statistics']['web_search'] = len(web_subs)
             self.log(f"Found {Colors.BOLD}{len(web_subs)}{Colors.END} subdomains from web sources", "success")
-            print()
         
         # DNS Zone Transfer
         if enable_zone:
-            self.log("Phase 3: DNS Zone Transfer", "info")
-            zt_subs = self.zone_transfer()
+            zt_subs = passive['zone_transfer'].result()
             results['statistics']['zone_transfer'] = len(zt_subs)
             if zt_subs:
                 self.log(f"Found {Colors.BOLD}{len(zt_subs)}{Colors.END} subdomains from zone transfer", "success")
             else:
                 self.log("Zone transfer not allowed (expected)", "warning")
+        if passive:
             print()
         
         # DNS Brute Force (Last because it's time-consuming)
@@ -130,72 +325,204 @@ class SubdomainHunter:
         results['scan_time'] = round(time.time() - self.start_time, 2)
         
         # Compile unique results
-        all_subs = sorted(list(self.subdomains))
+        all_subs = sorted(self.subdomains)
         results['subdomains'] = all_subs
         results['statistics']['total_unique'] = len(all_subs)
         
+        self.close_output()
         return results
     
+    def _in_scope(self, subdomain: str) -> bool:
+        """Check that a hostname is a concrete subdomain of the target"""
+        # Wildcard CT entries are common, so reject them before the suffix test;
+        # the leading dot in the suffix also rules out the apex and lookalikes
+        # such as notexample.com
+        return '*' not in subdomain and subdomain.endswith(self._suffix)
+    
+    def add_subdomain(self, subdomain: str) -> bool:
+        """Record a subdomain of the target; return True if it was not seen before"""
+        if not self._in_scope(subdomain):
+            return False
+        with self._lock:
+            count = len(self.subdomains)
+            self.subdomains.add(subdomain)
+            if len(self.subdomains) == count:
+                return False
+            if self._out_fp:
+                self._out_fp.write(f"{subdomain}\n")
+            return True
+    
+    def close_output(self):
+        """Close the streamed results file, if open"""
+        with self._lock:
+            if self._out_fp:
+                self._out_fp.close()
+                self._out_fp = None
+    
     def search_ct_logs(self) -> Set[str]:
         """Search Certificate Transparency logs"""
         found = set()
         
+        # Reuse a recent crt.sh response; CT logs change slowly
+        key = hashlib.blake2b(f"crt:{self.domain}".encode(), digest_size=16).hexdigest()
+        cache_path = os.path.join(CT_CACHE_DIR, f"{key}.json.gz")
+        if self.use_cache and os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < CT_CACHE_TTL:
+            try:
+                with gzip.open(cache_path, 'rb') as f:
+                    self._parse_ct(f, found)
+                if self.verbose:
+                    self.log("crt.sh results loaded from cache", "info")
+                return found
+            except Exception:
+                pass  # Unreadable cache entry, fetch again
+        
         # crt.sh - Primary source
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
         try:
             url = f"https://crt.sh/?q=%.{self.domain}&output=json"
-            response = requests.get(url, timeout=self.timeout * 2)
             
-            if response.status_code == 200:
-                data = response.json()
-                for entry in data:
-                    name = entry.get('name_value', '')
-                    for subdomain in name.split('\n'):
-                        subdomain = subdomain.strip().lower()
-                        if subdomain.endswith(self.domain) and '*' not in subdomain:
-                            if subdomain not in self.subdomains:
-                                found.add(subdomain)
-                                self.subdomains.add(subdomain)
-                                if self.verbose:
-                                    self.log(subdomain, "found")
+            # Stream-parse the response; large domains return tens of MB of JSON
+            with self.session.get(url, stream=True, timeout=self.timeout * 2) as response:
+                if response.status_code == 200:
+                    response.raw.decode_content = True
+                    if self.use_cache:
+                        # Compress the body to disk while it is being parsed
+                        os.makedirs(CT_CACHE_DIR, exist_ok=True)
+                        with gzip.open(tmp_path, 'wb', compresslevel=3) as sink:
+                            self._parse_ct(TeeReader(response.raw, sink), found)
+                        os.replace(tmp_path, cache_path)
+                    else:
+                        self._parse_ct(response.raw, found)
         except Exception as e:
             self.log(f"crt.sh query failed: {str(e)}", "error")
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
         
         return found
     
+    def _parse_ct(self, stream, found: Set[str]):
+        """Collect subdomains from a crt.sh JSON stream into found"""
+        # Filled in place so hosts parsed before a truncated or broken stream
+        # raises are still reported by the caller. found holds every CT host,
+        # not just those no other phase recorded first, so the count does not
+        # depend on which passive phase wins the race
+        for entry in ijson.items(stream, 'item'):
+            name = entry.get('name_value', '')
+            for line in name.splitlines():
+                subdomain = normalize_ct_name(line, self._suffix)
+                if subdomain:
+                    found.add(subdomain)
+                    if self.add_subdomain(subdomain) and self.verbose:
+                        self.log(subdomain, "found")
+    
     def dns_bruteforce(self, wordlist_path: str) -> Set[str]:
         """Brute-force subdomains using wordlist"""
-        found = set()
-        
         try:
-            with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
-                words = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            with open(wordlist_path, 'rb') as f:
+                data = f.read()
         except FileNotFoundError:
             self.log(f"Wordlist not found: {wordlist_path}", "error")
-            return found
+            return set()
+        
+        # Work on raw bytes: one read, C-level lower/split/strip, no per-line
+        # decode. DNS names are case-insensitive, so lowercase before
+        # dict.fromkeys drops duplicates (keeping wordlist order)
+        words = [word for word in map(bytes.strip, data.lower().splitlines())
+                 if word and not word.startswith(b'#')]
+        words = list(dict.fromkeys(words))
+        del data
+        
+        # Drop entries that can never be valid names instead of paying a
+        # network round-trip to learn that
+        max_length = 253 - len(self.domain) - 1
+        valid = [word for word in words if is_valid_label(word, max_length)]
+        skipped = len(words) - len(valid)
+        words = valid
         
         self.log(f"Loaded {len(words)} entries from wordlist", "info")
+        if skipped:
+            self.log(f"Skipped {skipped} invalid entries", "warning")
+        
+        return asyncio.run(self._brute_async(words))
+    
+    async def _brute_async(self, words) -> Set[str]:
+        """Resolve all wordlist candidates concurrently on one event loop"""
+        found = set()
+        
+        # Each query is a single UDP round-trip, so far more lookups can be in
+        # flight than we could afford OS threads for. Start at --threads and
+        # let _tune_concurrency / _note_outcome find the rate resolvers sustain
+        self._limit = max(self.threads, 1)
+        self._max_limit = max(BRUTE_MAX_CONCURRENCY, self.threads * 20)
+        self._slow_start = True
+        self._queries_recent = 0
+        self._failures_recent = 0
+        self._outcomes.clear()
         
-        def check_subdomain(word):
-            subdomain = f"{word}.{self.domain}"
-            if self.resolve_dns(subdomain):
-                return subdomain
-            return None
+        # Each query holds a UDP socket; past the open-file limit every lookup
+        # fails with EMFILE, so never allow more in flight than that
+        sockets = max_open_sockets()
+        if sockets is not None and sockets < self._max_limit:
+            self._max_limit = sockets
+            self._limit = min(self._limit, sockets)
+            self.log(f"Open file limit allows {sockets} concurrent DNS queries (raise it with 'ulimit -n')", "warning")
+        
+        # Wildcard zones answer every name; remember what a random label
+        # resolves to so matching hits can be discarded
+        probe = f"{uuid4().hex}.{self.domain}"
+        self._wildcard_ips = await self._lookup_async(probe) or frozenset()
+        if self._wildcard_ips:
+            self.log(f"Wildcard DNS detected ({', '.join(sorted(self._wildcard_ips))}), filtering matching results", "warning")
         
         # Progress tracking
         checked = 0
+        failed = 0
         total = len(words)
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.threads) as executor:
-            futures = {executor.submit(check_subdomain, word): word for word in words}
+        # Sliding window: only `self._limit` lookups exist as tasks at any time,
+        # so memory stays bounded and a slow timeout never stalls a whole batch.
+        # Lookups that got no usable answer go to `retry` and run again at the end
+        remaining = iter(words)
+        retry = deque()
+        pending = {}
+        flusher = asyncio.ensure_future(self._flush_hits_periodically())
+        tuner = asyncio.ensure_future(self._tune_concurrency())
+        domain_suffix = b'.' + self.domain.encode()
+        
+        while True:
+            while len(pending) < self._limit:
+                word = next(remaining, None)
+                if word is not None:
+                    host, attempt = word + domain_suffix, 0
+                elif retry:
+                    host, attempt = retry.popleft()
+                else:
+                    break
+                pending[asyncio.ensure_future(self._lookup_async(host))] = (host, attempt)
+            self._backlog = total - checked - len(pending)
+            if not pending:
+                break
             
-            for future in concurrent.futures.as_completed(futures):
-                result = future.result()
-                checked += 1
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                host, attempt = pending.pop(task)
+                addresses = task.result()
+                self._note_outcome(failed=addresses is None)
                 
-                if result:
+                if addresses is None:
+                    if attempt < BRUTE_RETRIES:
+                        retry.append((host, attempt + 1))
+                        continue
+                    failed += 1
+                elif addresses and not (self._wildcard_ips and addresses <= self._wildcard_ips):
+                    result = host.decode('ascii').lower()
                     found.add(result)
-                    self.subdomains.add(result)
-                    self.log(result, "found")
+                    self.add_subdomain(result)
+                    self._hits.append(self._format_log(result, "found"))
+                
+                checked += 1
                 
                 # Progress bar
                 if checked % 50 == 0 or checked == total:
@@ -203,18 +530,106 @@ class SubdomainHunter:
                     bar_length = 40
                     filled = int(bar_length * checked / total)
                     bar = '█' * filled + '░' * (bar_length - filled)
-                    print(f"\r{Colors.YELLOW}[*] Progress: [{bar}] {progress:.1f}% ({checked}/{total}){Colors.END}", end='', flush=True)
+                    self._progress_line = f"\r{Colors.YELLOW}[*] Progress: [{bar}] {progress:.1f}% ({checked}/{total}) [concurrency {self._limit}]{Colors.END}"
+                    print(self._progress_line, end='', flush=True)
+        
+        flusher.cancel()
+        tuner.cancel()
+        self._flush_hits()
         
         print()  # New line after progress bar
+        if failed:
+            self.log(f"{failed} lookups got no answer after {BRUTE_RETRIES + 1} attempts (timeouts or resolver errors); results may be incomplete", "warning")
         return found
     
-    def resolve_dns(self, hostname: str) -> bool:
-        """Check if hostname resolves"""
-        try:
-            self.resolver.resolve(hostname, 'A')
-            return True
-        except:
-            return False
+    async def _tune_concurrency(self):
+        """Grow the brute-force window while recent queries keep succeeding"""
+        while True:
+            await asyncio.sleep(BRUTE_TUNE_INTERVAL)
+            if not self._queries_recent:
+                continue
+            failure_rate = self._failures_recent / self._queries_recent
+            self._queries_recent = 0
+            self._failures_recent = 0
+            
+            # Only grow when the window is the bottleneck
+            if failure_rate < BRUTE_GROW_BELOW and self._backlog > 0:
+                step = self._limit if self._slow_start else BRUTE_TUNE_STEP
+                self._limit = min(self._limit + step, self._max_limit)
+    
+    def _note_outcome(self, failed: bool):
+        """Halve the brute-force window as soon as lookups start failing"""
+        # Runs per completed lookup rather than on the timer: local errors
+        # (EMFILE, ICMP unreachable) fail instantly and could drain the whole
+        # wordlist before the next tick
+        self._outcomes.append(failed)
+        if len(self._outcomes) < BRUTE_FAILURE_WINDOW:
+            return
+        if sum(self._outcomes) / len(self._outcomes) > BRUTE_SHRINK_ABOVE:
+            # The floor never exceeds the starting window, so a low --threads
+            # (rate-limited resolvers) is never raised by a failure spike
+            floor = min(self.threads, BRUTE_MIN_CONCURRENCY, self._max_limit)
+            self._limit = max(self._limit // 2, floor, 1)
+            self._slow_start = False
+            self._outcomes.clear()
+    
+    async def _lookup_async(self, hostname: Union[str, bytes]) -> Optional[FrozenSet[str]]:
+        """Resolve A records, retrying once on another resolver
+        
+        Returns an empty set for names that do not exist and None when no
+        resolver gave a usable answer (timeouts, SERVFAIL, local socket errors).
+        """
+        # The resolver only parses str names itself; wordlist hosts are bytes
+        qname = dns.name.from_text(hostname) if isinstance(hostname, bytes) else hostname
+        
+        for _ in range(2):
+            member = self._pick_resolver()
+            try:
+                # NoAnswer comes back as an empty rrset instead of an exception
+                answer = await member['resolver'].resolve(qname, 'A', raise_on_no_answer=False)
+                addresses = frozenset(rr.address for rr in answer.rrset) if answer.rrset else frozenset()
+            except dns.resolver.NXDOMAIN:
+                addresses = frozenset()
+            except dns.exception.DNSException:
+                # Timeouts and SERVFAIL say nothing about the name itself
+                self._record_resolver(member, failed=True)
+                continue
+            self._record_resolver(member, failed=False)
+            return addresses
+        
+        return None
+    
+    def _make_resolver(self, nameserver: str) -> dict:
+        """Build a pool member that sends every query to a single nameserver"""
+        resolver = dns.asyncresolver.Resolver(configure=False)
+        resolver.timeout = self.timeout
+        resolver.lifetime = self.timeout
+        resolver.nameservers = [nameserver]
+        return {
+            'nameserver': nameserver,
+            'resolver': resolver,
+            'results': deque(maxlen=RESOLVER_WINDOW),
+        }
+    
+    def _pick_resolver(self) -> dict:
+        """Return the next resolver in round-robin order"""
+        self._next_resolver = (self._next_resolver + 1) % len(self._resolver_pool)
+        return self._resolver_pool[self._next_resolver]
+    
+    def _record_resolver(self, member: dict, failed: bool):
+        """Track a query outcome and drop the resolver if it keeps failing"""
+        self._queries_recent += 1
+        self._failures_recent += failed
+        
+        results = member['results']
+        results.append(failed)
+        if len(results) < RESOLVER_MIN_SAMPLES or len(self._resolver_pool) == 1:
+            return
+        if sum(results) / len(results) > RESOLVER_MAX_ERROR_RATE and member in self._resolver_pool:
+            self._resolver_pool.remove(member)
+            # Only reached during brute-force: queue it with the hits so it
+            # prints above the progress bar instead of inside it
+            self._hits.append(self._format_log(f"Dropping resolver {member['nameserver']} (error rate above {RESOLVER_MAX_ERROR_RATE:.0%})", "warning"))
     
     def web_search(self) -> Set[str]:
         """Search for subdomains via web sources"""
@@ -225,33 +640,56 @@ class SubdomainHunter:
             'BufferOver': f"https://dns.bufferover.run/dns?q=.{self.domain}",
         }
         
-        for source_name, url in sources.items():
-            try:
-                response = requests.get(url, timeout=self.timeout * 2)
-                if response.status_code == 200:
-                    # Extract subdomains
-                    pattern = r'([a-zA-Z0-9][-a-zA-Z0-9]*\.)+' + re.escape(self.domain)
-                    matches = re.findall(pattern, response.text)
-                    
-                    source_count = 0
-                    for match in matches:
-                        subdomain = match.lower().rstrip('.')
-                        if subdomain.endswith(self.domain) and subdomain not in self.subdomains:
-                            found.add(subdomain)
-                            self.subdomains.add(subdomain)
-                            source_count += 1
-                            if self.verbose:
-                                self.log(subdomain, "found")
-                    
-                    if source_count > 0:
-                        self.log(f"{source_name}: {source_count} subdomains", "info")
+        # Sources are independent, so fetch them side by side; the phase then
+        # takes as long as the slowest source rather than the sum of all
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = {
+                executor.submit(self.session.get, url, timeout=self.timeout * 2): source_name
+                for source_name, url in sources.items()
+            }
+            
+            for future in concurrent.futures.as_completed(futures):
+                source_name = futures[future]
+                try:
+                    response = future.result()
+                    if response.status_code == 200:
+                        # Extract subdomains; counted per source regardless
+                        # of which source or phase recorded them first
+                        source_found = set()
+                        for subdomain in self._match_subdomains(response):
+                            if self._in_scope(subdomain):
+                                source_found.add(subdomain)
+                                if self.add_subdomain(subdomain) and self.verbose:
+                                    self.log(subdomain, "found")
+                        found |= source_found
                         
-            except Exception as e:
-                if self.verbose:
-                    self.log(f"{source_name} failed: {str(e)}", "error")
+                        if source_found:
+                            self.log(f"{source_name}: {len(source_found)} subdomains", "info")
+                            
+                except Exception as e:
+                    if self.verbose:
+                        self.log(f"{source_name} failed: {str(e)}", "error")
         
         return found
     
+    def _match_subdomains(self, response):
+        """Yield lowercased hostnames under the target found in a response body"""
+        content = response.content
+        
+        if self._subdomain_db is None:
+            for match in self._subdomain_re.finditer(content):
+                yield match.group(0).decode('ascii').lower()
+            return
+        
+        spans = []
+        
+        def on_match(match_id, start, end, flags, context):
+            spans.append((start, end))
+        
+        self._subdomain_db.scan(content, match_event_handler=on_match)
+        for start, end in spans:
+            yield content[start:end].decode('ascii').lower()
+    
     def zone_transfer(self) -> Set[str]:
         """Attempt DNS zone transfer (AXFR)"""
         found = set()
@@ -269,11 +707,11 @@ class SubdomainHunter:
                         dns.query.xfr(ns_server, self.domain, timeout=self.timeout)
                     )
                     for name in zone.nodes.keys():
-                        subdomain = f"{name}.{self.domain}".lower()
-                        found.add(subdomain)
-                        self.subdomains.add(subdomain)
-                        if self.verbose:
-                            self.log(subdomain, "found")
+                        subdomain = name.derelativize(zone.origin).to_text(omit_final_dot=True).lower()
+                        if self._in_scope(subdomain):
+                            found.add(subdomain)
+                            if self.add_subdomain(subdomain) and self.verbose:
+                                self.log(subdomain, "found")
                 except:
                     continue
         except:
@@ -283,15 +721,21 @@ class SubdomainHunter:
     
     def export_results(self, results: Dict, output_format: str = 'txt', output_file: str = None):
         """Export results to file"""
+        self.close_output()
         if not output_file:
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            output_file = f"subdomains_{self.domain}_{timestamp}"
+            output_file = self.output_file
         
         if output_format == 'json':
             filename = f"{output_file}.json"
             with open(filename, 'w') as f:
                 json.dump(results, f, indent=2)
+            # The partial-results stream is only a crash safeguard; once the
+            # JSON is safely written it would just be a stray duplicate
+            if self._stream_path and os.path.exists(self._stream_path):
+                os.remove(self._stream_path)
+            self._stream_path = None
         elif output_format == 'txt':
+            # Rewrite the streamed file (discovery order) in sorted order
             filename = f"{output_file}.txt"
             with open(filename, 'w') as f:
                 for subdomain in results['subdomains']:
@@ -360,9 +804,11 @@ def main():
     parser.add_argument('-w', '--wordlist', 
                        help='Path to wordlist file for brute-force')
     parser.add_argument('-t', '--threads', type=int, default=50, 
-                       help='Number of threads (default: 50)')
+                       help='Initial number of DNS queries in flight, auto-tuned up to 20x this (min 2000) during the scan (default: 50)')
     parser.add_argument('--timeout', type=int, default=5, 
                        help='DNS timeout in seconds (default: 5)')
+    parser.add_argument('--resolvers', 
+                       help='File with DNS resolver IPs to use, one per line')
     parser.add_argument('-v', '--verbose', action='store_true', 
                        help='Enable verbose output')
     parser.add_argument('--no-ct', action='store_true', 
@@ -373,6 +819,8 @@ def main():
                        help='Disable web source search')
     parser.add_argument('--no-zone', action='store_true', 
                        help='Disable zone transfer attempt')
+    parser.add_argument('--no-cache', action='store_true', 
+                       help='Ignore cached crt.sh results and do not write new ones')
     parser.add_argument('-o', '--output', choices=['txt', 'json'], default='txt', 
                        help='Output format (default: txt)')
     parser.add_argument('-f', '--file', 
@@ -407,13 +855,33 @@ def main():
             print(f"{Colors.YELLOW}[!] Use -w flag to specify a wordlist for brute-force.{Colors.END}")
             args.no_brute = True
     
+    # Load custom resolvers
+    resolvers = None
+    if args.resolvers:
+        try:
+            with open(args.resolvers, 'r') as f:
+                resolvers = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        except FileNotFoundError:
+            print(f"{Colors.RED}[!] Resolver file not found: {args.resolvers}{Colors.END}")
+            sys.exit(1)
+        if not resolvers:
+            print(f"{Colors.RED}[!] No resolvers found in: {args.resolvers}{Colors.END}")
+            sys.exit(1)
+    
     # Initialize hunter
-    hunter = SubdomainHunter(
-        domain=domain,
-        threads=args.threads,
-        timeout=args.timeout,
-        verbose=args.verbose
-    )
+    try:
+        hunter = SubdomainHunter(
+            domain=domain,
+            threads=args.threads,
+            timeout=args.timeout,
+            verbose=args.verbose,
+            resolvers=resolvers,
+            use_cache=not args.no_cache,
+            output_file=args.file
+        )
+    except ValueError as e:
+        print(f"{Colors.RED}[!] Invalid resolver: {str(e)}{Colors.END}")
+        sys.exit(1)
     
     try:
         # Run scan
@@ -438,19 +906,22 @@ def main():
             print()
         
         # Export results
-        hunter.export_results(results, output_format=args.output, output_file=args.file)
+        hunter.export_results(results, output_format=args.output)
         
         print()
         print(f"{Colors.GREEN}{Colors.BOLD}[✓] Scan completed successfully!{Colors.END}")
         
     except KeyboardInterrupt:
+        hunter.close_output()
         print(f"\n{Colors.RED}[!] Scan interrupted by user{Colors.END}")
+        if hunter.subdomains:
+            print(f"{Colors.YELLOW}[!] Partial results saved to: {hunter.output_file}.txt{Colors.END}")
         sys.exit(1)
     except Exception as e:
+        hunter.close_output()
         print(f"{Colors.RED}[!] Error: {str(e)}{Colors.END}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    import os
     main()
\ No newline at end of file